@@ -0,0 +1,38 @@
+# Numeric kernels for the game's aggregate calculations.
+# Kept free of Streamlit so they can be reused outside the app (e.g. for
+# balance simulations over many games). Compiled with Numba when installed.
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    # Numba is optional; without it the kernels run as plain NumPy code
+    def njit(**kwargs):
+        return lambda func: func
+
+# Direct complexity from technologies plus the interaction complexity between
+# active technologies, accumulated in a single pass over the levels
+@njit(cache=True)
+def compute_tech_complexity(levels, factors):
+    direct = 0.0
+    level_sum = 0.0
+    n_active = 0
+    for i in range(levels.shape[0]):
+        direct += levels[i] * factors[i]
+        level_sum += levels[i]
+        if levels[i] > 0:
+            n_active += 1
+    interaction_level = level_sum / max(n_active, 1)
+    interaction = max(0, n_active - 1) * interaction_level * 0.5
+    return direct, interaction
+
+# Total institutional capacity, scaled by the Information Systems bonus
+@njit(cache=True)
+def compute_capacity(levels, factors, multiplier):
+    return np.sum(levels * factors) * multiplier
+
+# Base complexity growth modifier: each tech level accelerates growth by 1%,
+# Clean Energy counteracts it
+@njit(cache=True)
+def compute_growth_modifier(total_tech_level, energy_reduction):
+    return (1 + total_tech_level * 0.01) * (1 - energy_reduction)
@@ -5,6 +5,8 @@ import numpy as np
 import altair as alt
 import time
 
+from _core import compute_capacity, compute_growth_modifier, compute_tech_complexity
+
 # Set page configuration
 st.set_page_config(
     page_title="Technology vs. Complexity",
@@ -13,6 +15,74 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Sidebar help text
+SIDEBAR_MD = """
+### How to Play
+
+In this simulation, you manage society's technological development while building social capacity to handle complexity.
+
+**Key Concepts:**
+- Technologies advance capabilities but increase complexity
+- Social institutions help absorb and manage complexity
+- When complexity exceeds capacity, crises occur
+- The goal is sustainable progress, not just maximum technology
+
+**Game Rules:**
+- You have 2 actions per turn
+- You can invest in technologies or upgrade institutions
+- After each turn, complexity grows naturally
+- Game ends after 30 turns or if complexity overwhelms capacity
+"""
+
+# Lessons shown on the game-over screen
+TECH_LESSONS_MD = """
+- Technology creates both opportunities and complexities
+- Different technologies interact to create additional complexity
+- Some technologies can help manage complexity (like Clean Energy)
+- Balanced technological development is more sustainable
+"""
+
+SOCIAL_LESSONS_MD = """
+- Social systems need to evolve alongside technology
+- Crisis occurs when complexity outpaces absorption capacity
+- Different institutions address different aspects of complexity
+- Sustainable progress requires balance and foresight
+"""
+
+# Length of a game in turns
+MAX_TURNS = 30
+
+# Possible crisis events, chosen at random when complexity exceeds capacity
+_CRISIS_EVENTS = (
+    {
+        "name": "Public Backlash", 
+        "effect": "Research slowed",
+        "description": "Public fear of technology leads to funding cuts and protests",
+        "icon": "🗣️"
+    },
+    {
+        "name": "Technological Accident", 
+        "effect": "Complexity increased",
+        "description": "An unforeseen interaction between technologies creates new risks",
+        "icon": "💥"
+    },
+    {
+        "name": "Institutional Failure", 
+        "effect": "Capacity decreased",
+        "description": "A key social institution proves unable to handle the pace of change",
+        "icon": "🏚️"
+    },
+    {
+        "name": "Resource Shortage", 
+        "effect": "Research points reduced",
+        "description": "Critical resources are depleted or misallocated amid complexity",
+        "icon": "📉"
+    }
+)
+
+# Indices of the technologies in TechProgressGame's per-technology arrays
+AI_AUTOMATION, BIOTECH, CLEAN_ENERGY, INFO_SYS = range(4)
+
 # Game logic class
 class TechProgressGame:
     def __init__(self):
@@ -21,31 +91,27 @@ class TechProgressGame:
         self.research_points = 100
         self.complexity = 10
         
-        # Technology domains with different characteristics
+        # Technology domains with different characteristics (levels are kept in self.tech_levels)
         self.technologies = {
             'AI & Automation': {
-                'level': 0, 
                 'complexity_factor': 1.8,
                 'description': 'Increases efficiency but creates high complexity through societal disruption',
                 'research_bonus': 0.1,  # Increases research points per turn
                 'icon': '🤖'
             },
             'Biotechnology': {
-                'level': 0, 
                 'complexity_factor': 1.5,
                 'description': 'Provides health benefits but introduces ethical and safety challenges',
                 'crisis_resistance': 0.1,  # Reduces crisis severity
                 'icon': '🧬'
             },
             'Clean Energy': {
-                'level': 0, 
                 'complexity_factor': 0.8,
                 'description': 'Reduces environmental complexity but requires new infrastructure',
                 'complexity_reduction': 0.05,  # Reduces complexity growth rate
                 'icon': '🌱'
             },
             'Information Systems': {
-                'level': 0, 
                 'complexity_factor': 1.3,
                 'description': 'Helps manage complexity but introduces new vulnerabilities',
                 'capacity_bonus': 0.1,  # Increases effectiveness of institutions
@@ -53,31 +119,42 @@ class TechProgressGame:
             }
         }
         
-        # Social institutions with specific effects
+        # Per-technology arrays, in the order of the AI_AUTOMATION..INFO_SYS indices
+        self.tech_names = list(self.technologies.keys())
+        self.tech_icons = [data['icon'] for data in self.technologies.values()]
+        self.tech_labels = [f"{icon} {name}" for icon, name in zip(self.tech_icons, self.tech_names)]
+        self.tech_levels = np.zeros(len(self.tech_names), dtype=np.int64)
+        self.tech_complexity_factors = np.array([data['complexity_factor'] for data in self.technologies.values()])
+        self.tech_research_bonus = np.array([data.get('research_bonus', 0.0) for data in self.technologies.values()])
+        self.tech_crisis_resistance = np.array([data.get('crisis_resistance', 0.0) for data in self.technologies.values()])
+        self.tech_complexity_reduction = np.array([data.get('complexity_reduction', 0.0) for data in self.technologies.values()])
+        self.tech_capacity_bonus = np.array([data.get('capacity_bonus', 0.0) for data in self.technologies.values()])
+        # Per-level strength of each technology's special effect. Each technology must have
+        # exactly one effect; a second one would be added into the same percentage
+        self._tech_effect_per_level = self.tech_research_bonus + self.tech_crisis_resistance + self.tech_complexity_reduction + self.tech_capacity_bonus
+        self._total_tech_level = 0
+        
+        # Social institutions with specific effects (levels are kept in self.inst_levels)
         self.institutions = {
             'Education System': {
-                'level': 1, 
                 'capacity_factor': 1.8, 
                 'cost': 15,
                 'description': 'Increases public understanding and adaptation to new technologies',
                 'icon': '🎓'
             },
             'Regulatory Framework': {
-                'level': 1, 
                 'capacity_factor': 1.5, 
                 'cost': 18,
                 'description': 'Manages technological risks and provides safety guidelines',
                 'icon': '⚖️'
             },
             'Scientific Community': {
-                'level': 1, 
                 'capacity_factor': 1.7, 
                 'cost': 20,
                 'description': 'Assesses technologies and builds shared knowledge',
                 'icon': '🔬'
             },
             'Social Safety Net': {
-                'level': 1, 
                 'capacity_factor': 1.4, 
                 'cost': 12,
                 'description': 'Protects people from disruption and helps adaptation',
@@ -85,74 +162,121 @@ class TechProgressGame:
             }
         }
         
+        # Per-institution arrays; every institution starts at level 1
+        self.inst_names = list(self.institutions.keys())
+        self.inst_icons = [data['icon'] for data in self.institutions.values()]
+        self.inst_labels = [f"{icon} {name}" for icon, name in zip(self.inst_icons, self.inst_names)]
+        self.inst_levels = np.ones(len(self.inst_names), dtype=np.int64)
+        self.inst_capacity_factors = np.array([data['capacity_factor'] for data in self.institutions.values()])
+        self.inst_costs = np.array([data['cost'] for data in self.institutions.values()], dtype=np.int64)
+        self._total_inst_level = int(self.inst_levels.sum())
+        
         # Game progression parameters
         self.complexity_growth_rate = 1.08  # 8% base increase per turn
         self.research_points_per_turn = 50
         self.crisis_threshold = 0.2  # Crisis happens when complexity exceeds capacity by this ratio
         self.complexity_components = {}  # For analysis
         
-        # Game history tracking
+        # Cached totals. Any method that changes technology or institution levels
+        # or the base complexity must call _invalidate_cache() afterwards
+        self._complexity_cache = None
+        self._capacity_cache = None
+        self._last_growth_mod = None
+        self._display_cache = None
+        
+        # Game history tracking, preallocated for every turn and indexed by turn number
+        history_len = MAX_TURNS + 1
         self.history = {
-            'turns': [0],
-            'complexity': [self.calculate_total_complexity()],
-            'capacity': [self.calculate_total_social_capacity()],
-            'research_points': [self.research_points],
-            'crisis_events': [None]
+            'turns': np.arange(history_len),
+            'complexity': np.zeros(history_len),
+            'capacity': np.zeros(history_len),
+            'research_points': np.zeros(history_len, dtype=np.int64),
+            'crisis_events': [None] * history_len
         }
+        initial_complexity, initial_capacity = self.calculate_totals()
+        self.history['complexity'][0] = initial_complexity
+        self.history['capacity'][0] = initial_capacity
+        self.history['research_points'][0] = self.research_points
+    
+    # Turns, complexity and capacity recorded so far, as tuples for the cached history chart
+    def history_series(self):
+        recorded = min(self.turn, MAX_TURNS) + 1
+        return (
+            tuple(self.history['turns'][:recorded].tolist()),
+            tuple(self.history['complexity'][:recorded].tolist()),
+            tuple(self.history['capacity'][:recorded].tolist())
+        )
+    
+    # Running totals of all technology and institution levels
+    def summary_levels(self):
+        return self._total_tech_level, self._total_inst_level
+    
+    def _invalidate_cache(self):
+        self._complexity_cache = None
+        self._capacity_cache = None
+        self._last_growth_mod = None
+        self._display_cache = None
     
     def calculate_total_social_capacity(self):
-        # Base capacity from institutions
-        total_capacity = 0
-        for inst, data in self.institutions.items():
-            total_capacity += data['level'] * data['capacity_factor']
+        if self._capacity_cache is not None:
+            return self._capacity_cache
         
         # Add bonus from Information Systems if developed
-        info_sys_level = self.technologies['Information Systems']['level']
-        info_sys_bonus = info_sys_level * self.technologies['Information Systems']['capacity_bonus']
+        info_sys_bonus = self.tech_levels[INFO_SYS] * self.tech_capacity_bonus[INFO_SYS]
         capacity_multiplier = 1 + info_sys_bonus
         
-        return total_capacity * capacity_multiplier
+        # Base capacity from institutions, scaled by the bonus
+        self._capacity_cache = float(compute_capacity(self.inst_levels, self.inst_capacity_factors, capacity_multiplier))
+        return self._capacity_cache
+    
+    # Strength of each technology's special effect in percent, indexed like tech_levels
+    def tech_effect_percentages(self):
+        if self._display_cache is None:
+            self._display_cache = self.tech_levels * self._tech_effect_per_level * 100
+            # Read-only so callers cannot corrupt the cached values
+            self._display_cache.setflags(write=False)
+        return self._display_cache
+    
+    # Complexity and capacity together, for callers that need both
+    def calculate_totals(self):
+        return self.calculate_total_complexity(), self.calculate_total_social_capacity()
     
     def calculate_complexity_growth_modifier(self):
+        if self._last_growth_mod is not None:
+            return self._last_growth_mod
+        
         # Determine if Clean Energy is reducing complexity growth
-        energy_level = self.technologies['Clean Energy']['level']
-        energy_reduction = energy_level * self.technologies['Clean Energy']['complexity_reduction']
-        
-        # More tech generally accelerates complexity
-        tech_levels_sum = sum(tech['level'] for tech in self.technologies.values())
-        tech_acceleration = 1 + (tech_levels_sum * 0.01)  # Each tech level increases growth by 1%
-        
-        # Final modifier (Clean Energy counteracts general acceleration)
-        return tech_acceleration * (1 - energy_reduction)
-    
-    def calculate_total_complexity(self):
-        # Base complexity
-        base_complexity = self.complexity
-        
-        # Direct complexity from technologies
-        tech_complexity = 0
-        for tech, data in self.technologies.items():
-            tech_complexity += data['level'] * data['complexity_factor']
-        
-        # Interaction effects between technologies (more technologies = more interaction complexity)
-        tech_interaction = 0
-        active_techs = [tech for tech, data in self.technologies.items() if data['level'] > 0]
-        if len(active_techs) > 1:
-            # The more different technologies at high levels, the more interaction complexity
-            active_tech_data = [self.technologies[tech] for tech in active_techs]
-            interaction_level = sum(tech['level'] for tech in active_tech_data) / len(active_techs)
-            tech_interaction = (len(active_techs) - 1) * interaction_level * 0.5
-        
-        # Total complexity
-        total = base_complexity + tech_complexity + tech_interaction
-        
-        # Store components for analysis
-        self.complexity_components = {
-            'base': base_complexity,
-            'tech_direct': tech_complexity,
-            'tech_interaction': tech_interaction,
-            'total': total
-        }
+        energy_reduction = self.tech_levels[CLEAN_ENERGY] * self.tech_complexity_reduction[CLEAN_ENERGY]
+        
+        # More tech generally accelerates complexity, Clean Energy counteracts it
+        self._last_growth_mod = float(compute_growth_modifier(self._total_tech_level, energy_reduction))
+        return self._last_growth_mod
+    
+    def calculate_total_complexity(self, include_breakdown=False):
+        if self._complexity_cache is None:
+            # Base complexity
+            base_complexity = self.complexity
+            
+            # Direct complexity from technologies and interaction effects between them
+            # (more technologies = more interaction complexity)
+            tech_complexity, tech_interaction = compute_tech_complexity(self.tech_levels, self.tech_complexity_factors)
+            tech_complexity = float(tech_complexity)
+            tech_interaction = float(tech_interaction)
+            
+            # Total complexity
+            total = base_complexity + tech_complexity + tech_interaction
+            self._complexity_cache = (base_complexity, tech_complexity, tech_interaction, total)
+        
+        base_complexity, tech_complexity, tech_interaction, total = self._complexity_cache
+        
+        # Store components for analysis only when requested
+        if include_breakdown:
+            self.complexity_components = {
+                'base': base_complexity,
+                'tech_direct': tech_complexity,
+                'tech_interaction': tech_interaction,
+                'total': total
+            }
         
         return total
     
@@ -164,7 +288,8 @@ class TechProgressGame:
             return False, "Not enough research points"
         
         # Calculate how many levels this buys (costs increase with level)
-        current_level = self.technologies[tech_name]['level']
+        tech_idx = self.tech_names.index(tech_name)
+        current_level = int(self.tech_levels[tech_idx])
         cost_per_level = 10 + (current_level * 2)  # Increasing costs for higher levels
         levels_gained = amount // cost_per_level
         
@@ -172,34 +297,37 @@ class TechProgressGame:
             return False, f"Need at least {cost_per_level} points for one level"
         
         # Invest in technology
-        self.technologies[tech_name]['level'] += levels_gained
+        self.tech_levels[tech_idx] += levels_gained
+        self._total_tech_level += levels_gained
         actual_cost = levels_gained * cost_per_level
         self.research_points -= actual_cost
+        self._invalidate_cache()
         
-        return True, f"Invested {actual_cost} points in {tech_name}, new level: {self.technologies[tech_name]['level']} (+{levels_gained})"
+        return True, f"Invested {actual_cost} points in {tech_name}, new level: {self.tech_levels[tech_idx]} (+{levels_gained})"
     
     def invest_in_institution(self, inst_name):
         if inst_name not in self.institutions:
             return False, f"{inst_name} is not a valid institution"
         
-        inst = self.institutions[inst_name]
-        cost = inst['cost'] * inst['level']  # Increasing costs for higher levels
+        inst_idx = self.inst_names.index(inst_name)
+        cost = int(self.inst_costs[inst_idx] * self.inst_levels[inst_idx])  # Increasing costs for higher levels
         
         if cost > self.research_points:
             return False, f"Need {cost} points to upgrade {inst_name}, but only have {self.research_points}"
         
         # Invest in institution
-        self.institutions[inst_name]['level'] += 1
+        self.inst_levels[inst_idx] += 1
+        self._total_inst_level += 1
         self.research_points -= cost
+        self._invalidate_cache()
         
-        return True, f"Upgraded {inst_name}, new level: {self.institutions[inst_name]['level']} (cost: {cost})"
+        return True, f"Upgraded {inst_name}, new level: {self.inst_levels[inst_idx]} (cost: {cost})"
     
     def next_turn(self):
         self.turn += 1
         
         # Calculate current complexity and capacity
-        current_complexity = self.calculate_total_complexity()
-        current_capacity = self.calculate_total_social_capacity()
+        current_complexity, current_capacity = self.calculate_totals()
         complexity_growth_modifier = self.calculate_complexity_growth_modifier()
         
         # Check for crisis
@@ -210,21 +338,21 @@ class TechProgressGame:
             crisis_event = self.trigger_crisis(severity)
         
         # Calculate research points bonus from AI & Automation
-        ai_level = self.technologies['AI & Automation']['level']
-        research_multiplier = 1 + (ai_level * self.technologies['AI & Automation']['research_bonus'])
+        research_multiplier = 1 + (self.tech_levels[AI_AUTOMATION] * self.tech_research_bonus[AI_AUTOMATION])
         
         # Award new research points
         self.research_points += int(self.research_points_per_turn * research_multiplier)
         
         # Increase base complexity (representing advancing global technology)
         self.complexity *= self.complexity_growth_rate * complexity_growth_modifier
+        self._invalidate_cache()
         
-        # Update history
-        self.history['turns'].append(self.turn)
-        self.history['complexity'].append(current_complexity)
-        self.history['capacity'].append(current_capacity)
-        self.history['research_points'].append(self.research_points)
-        self.history['crisis_events'].append(crisis_event)
+        # Update history (valid entries are [:self.turn + 1]; turns past MAX_TURNS are not recorded)
+        if self.turn <= MAX_TURNS:
+            self.history['complexity'][self.turn] = current_complexity
+            self.history['capacity'][self.turn] = current_capacity
+            self.history['research_points'][self.turn] = self.research_points
+            self.history['crisis_events'][self.turn] = crisis_event
         
         # Return turn summary
         return {
@@ -238,63 +366,50 @@ class TechProgressGame:
             'crisis_event': crisis_event
         }
     
+    # Crisis effect handlers, each returning the message shown to the player
+    def _handle_backlash(self, adjusted_severity):
+        self.research_points_per_turn = max(10, int(self.research_points_per_turn * (1 - adjusted_severity/2)))
+        return f"Public backlash against technology reduced research funding. Points per turn now: {self.research_points_per_turn}"
+    
+    def _handle_accident(self, adjusted_severity):
+        complexity_increase = int(self.complexity * adjusted_severity)
+        self.complexity += complexity_increase
+        return f"A technological accident increased complexity by {complexity_increase}"
+    
+    def _handle_institutional_failure(self, adjusted_severity):
+        # Reduce a random institution's effectiveness
+        institution = random.choice(self.inst_names)
+        inst_idx = self.inst_names.index(institution)
+        old_level = int(self.inst_levels[inst_idx])
+        level_reduction = max(1, int(old_level * adjusted_severity))
+        self.inst_levels[inst_idx] = max(1, old_level - level_reduction)
+        self._total_inst_level += int(self.inst_levels[inst_idx]) - old_level
+        return f"{institution} suffered a setback, losing {level_reduction} levels"
+    
+    def _handle_resource_shortage(self, adjusted_severity):
+        loss = int(self.research_points * adjusted_severity)
+        self.research_points = max(0, self.research_points - loss)
+        return f"Resource shortage resulted in the loss of {loss} research points"
+    
+    _CRISIS_HANDLERS = {
+        "Public Backlash": _handle_backlash,
+        "Technological Accident": _handle_accident,
+        "Institutional Failure": _handle_institutional_failure,
+        "Resource Shortage": _handle_resource_shortage
+    }
+    
     def trigger_crisis(self, severity):
-        crisis_events = [
-            {
-                "name": "Public Backlash", 
-                "effect": "Research slowed",
-                "description": "Public fear of technology leads to funding cuts and protests",
-                "icon": "🗣️"
-            },
-            {
-                "name": "Technological Accident", 
-                "effect": "Complexity increased",
-                "description": "An unforeseen interaction between technologies creates new risks",
-                "icon": "💥"
-            },
-            {
-                "name": "Institutional Failure", 
-                "effect": "Capacity decreased",
-                "description": "A key social institution proves unable to handle the pace of change",
-                "icon": "🏚️"
-            },
-            {
-                "name": "Resource Shortage", 
-                "effect": "Research points reduced",
-                "description": "Critical resources are depleted or misallocated amid complexity",
-                "icon": "📉"
-            }
-        ]
-        
         # Select a crisis based on severity
-        crisis = random.choice(crisis_events)
+        crisis = random.choice(_CRISIS_EVENTS)
         
         # Reduce severity if Biotechnology is advanced (better crisis management)
-        biotech_level = self.technologies['Biotechnology']['level']
-        crisis_resistance = biotech_level * self.technologies['Biotechnology']['crisis_resistance']
+        crisis_resistance = self.tech_levels[BIOTECH] * self.tech_crisis_resistance[BIOTECH]
         adjusted_severity = severity * (1 - crisis_resistance)
         
         # Apply crisis effects
-        if crisis["name"] == "Public Backlash":
-            self.research_points_per_turn = max(10, int(self.research_points_per_turn * (1 - adjusted_severity/2)))
-            message = f"Public backlash against technology reduced research funding. Points per turn now: {self.research_points_per_turn}"
-        
-        elif crisis["name"] == "Technological Accident":
-            complexity_increase = int(self.complexity * adjusted_severity)
-            self.complexity += complexity_increase
-            message = f"A technological accident increased complexity by {complexity_increase}"
-        
-        elif crisis["name"] == "Institutional Failure":
-            # Reduce a random institution's effectiveness
-            institution = random.choice(list(self.institutions.keys()))
-            level_reduction = max(1, int(self.institutions[institution]['level'] * adjusted_severity))
-            self.institutions[institution]['level'] = max(1, self.institutions[institution]['level'] - level_reduction)
-            message = f"{institution} suffered a setback, losing {level_reduction} levels"
-        
-        elif crisis["name"] == "Resource Shortage":
-            loss = int(self.research_points * adjusted_severity)
-            self.research_points = max(0, self.research_points - loss)
-            message = f"Resource shortage resulted in the loss of {loss} research points"
+        message = self._CRISIS_HANDLERS[crisis["name"]](self, adjusted_severity)
+        
+        self._invalidate_cache()
         
         return {
             "name": crisis["name"],
@@ -305,15 +420,15 @@ class TechProgressGame:
             "icon": crisis["icon"]
         }
     
-    def game_status(self):
+    def game_status(self, current_complexity=None, current_capacity=None):
         # Check if game is over
-        current_complexity = self.calculate_total_complexity()
-        current_capacity = self.calculate_total_social_capacity()
+        if current_complexity is None or current_capacity is None:
+            current_complexity, current_capacity = self.calculate_totals()
         
         if current_complexity > current_capacity * 3:
             return "GAME OVER: Complexity catastrophically overwhelmed society's capacity"
         
-        if self.turn >= 30:
+        if self.turn >= MAX_TURNS:
             if current_capacity > current_complexity * 1.1:
                 return "VICTORY: Achieved sustainable technological progress"
             elif current_capacity > current_complexity:
@@ -323,33 +438,30 @@ class TechProgressGame:
         
         return "ONGOING"
 
+# Chart builders take plain data rather than the game object so that
+# Streamlit can cache them and skip rebuilding unchanged charts on rerun
+
 # Function to create progress charts
-def create_history_chart(game):
-    # Prepare the data
-    chart_data = pd.DataFrame({
-        'Turn': game.history['turns'],
-        'Complexity': game.history['complexity'],
-        'Absorption Capacity': game.history['capacity']
-    })
-    
-    # Reshape for Altair
-    chart_data_long = pd.melt(
-        chart_data, 
-        id_vars=['Turn'], 
-        value_vars=['Complexity', 'Absorption Capacity'],
-        var_name='Metric', 
-        value_name='Value'
+@st.cache_data(ttl=3600, max_entries=64)
+def create_history_chart(turns, complexity, capacity):
+    # Prepare the data in long form for Altair
+    chart_data_long = pd.DataFrame.from_records(
+        [(t, 'Complexity', v) for t, v in zip(turns, complexity)]
+        + [(t, 'Absorption Capacity', v) for t, v in zip(turns, capacity)],
+        columns=['Turn', 'Metric', 'Value']
     )
     
-    # Create and return the chart
-    chart = alt.Chart(chart_data_long).mark_line(point=True).encode(
+    # Create and return the chart (point markers only while there are few turns,
+    # to keep the number of rendered SVG nodes down in long games)
+    num_turns = len(turns)
+    chart = alt.Chart(chart_data_long).mark_line(point=num_turns < 15).encode(
         x=alt.X('Turn:Q', title='Turn'),
         y=alt.Y('Value:Q', title='Level'),
         color=alt.Color('Metric:N', scale=alt.Scale(
             domain=['Complexity', 'Absorption Capacity'],
             range=['#FF6347', '#2E8B57']
         )),
-        tooltip=['Turn', 'Metric', 'Value']
+        tooltip=['Turn:Q', 'Metric:N', 'Value:Q']
     ).properties(
         title='Progress Over Time',
         width=600,
@@ -359,17 +471,14 @@ def create_history_chart(game):
     return chart
 
 # Function to create complexity breakdown chart
-def create_complexity_chart(game):
+@st.cache_data(ttl=3600, max_entries=64)
+def create_complexity_chart(base, tech_direct, tech_interaction):
     # Prepare data
-    data = {
-        'Source': ['Base Complexity', 'Technology Direct', 'Technology Interactions'],
-        'Value': [
-            game.complexity_components['base'],
-            game.complexity_components['tech_direct'],
-            game.complexity_components['tech_interaction']
-        ]
-    }
-    chart_data = pd.DataFrame(data)
+    chart_data = pd.DataFrame.from_records([
+        ('Base Complexity', base),
+        ('Technology Direct', tech_direct),
+        ('Technology Interactions', tech_interaction)
+    ], columns=['Source', 'Value'])
     
     # Create and return the chart
     chart = alt.Chart(chart_data).mark_bar().encode(
@@ -379,7 +488,7 @@ def create_complexity_chart(game):
             domain=['Base Complexity', 'Technology Direct', 'Technology Interactions'],
             range=['#FFA07A', '#FF6347', '#8B0000']
         )),
-        tooltip=['Source', 'Value']
+        tooltip=['Source:N', 'Value:Q']
     ).properties(
         title='Complexity Sources',
         width=300,
@@ -389,18 +498,13 @@ def create_complexity_chart(game):
     return chart
 
 # Function to create capacity breakdown chart
-def create_capacity_chart(game):
+@st.cache_data(ttl=3600, max_entries=64)
+def create_capacity_chart(names, values, icons):
     # Prepare data
-    data = []
-    for inst, inst_data in game.institutions.items():
-        inst_capacity = inst_data['level'] * inst_data['capacity_factor']
-        data.append({
-            'Institution': inst,
-            'Value': inst_capacity,
-            'Icon': inst_data['icon']
-        })
-    
-    chart_data = pd.DataFrame(data)
+    chart_data = pd.DataFrame.from_records(
+        list(zip(names, values, icons)),
+        columns=['Institution', 'Value', 'Icon']
+    )
     
     # Create and return the chart
     chart = alt.Chart(chart_data).mark_bar().encode(
@@ -409,7 +513,7 @@ def create_capacity_chart(game):
         color=alt.Color('Institution:N', scale=alt.Scale(
             range=['#66CDAA', '#3CB371', '#2E8B57', '#006400']
         )),
-        tooltip=['Institution', 'Value']
+        tooltip=['Institution:N', 'Value:Q']
     ).properties(
         title='Capacity Sources',
         width=300,
@@ -418,21 +522,79 @@ def create_capacity_chart(game):
     
     return chart
 
+# Function to create final technology levels data, indexed by label for st.bar_chart
+@st.cache_data(ttl=3600, max_entries=64)
+def create_tech_levels_data(tech_labels, tech_levels):
+    tech_df = pd.DataFrame({
+        'Technology': list(tech_labels),
+        'Level': np.array(tech_levels, dtype=np.int32)
+    })
+    
+    return tech_df.set_index('Technology')
+
+# Function to create final institution levels data, indexed by label for st.bar_chart
+@st.cache_data(ttl=3600, max_entries=64)
+def create_institution_levels_data(inst_labels, inst_levels):
+    inst_df = pd.DataFrame({
+        'Institution': list(inst_labels),
+        'Level': np.array(inst_levels, dtype=np.int32)
+    })
+    
+    return inst_df.set_index('Institution')
+
+# Function to build the technology selection labels
+@st.cache_data(ttl=3600, max_entries=64)
+def build_tech_options(tech_labels, tech_levels):
+    return [
+        f"{label} (Cost: {10 + (level * 2)} per level)"
+        for label, level in zip(tech_labels, tech_levels)
+    ]
+
+# Session state for a fresh game (the game object itself is created separately)
+_RESET_STATE = {
+    'game_status': "ONGOING",
+    'message': "",
+    'turn_summary': None,
+    '_state_dirty': True,
+    'show_analysis': False,
+    'tech_amount': 0,
+    'selected_tech': None,
+    'selected_inst': None,
+    'actions_taken': 0,
+    'max_actions': 2,
+    'game_over': False,
+    'restart': False,
+    'final_tech_levels': None,
+    'final_inst_levels': None,
+    'final_history_chart': None,
+    '_balloons_shown': False
+}
+
+# Start a new game with fresh session state
+def reset_session_state():
+    st.session_state.update(_RESET_STATE)
+    st.session_state.game = TechProgressGame()
+
+# Button callbacks that only flip a flag; they run before the rerun triggered
+# by the click, so no second st.rerun() is needed to pick up the change
+def request_restart():
+    st.session_state.restart = True
+
+def close_analysis():
+    st.session_state.show_analysis = False
+
+# Current complexity and capacity; they only change when an action is taken
+# or a turn ends, so UI-only reruns reuse the values stored in session state
+def get_current_totals(game):
+    if st.session_state.get('_state_dirty', True):
+        st.session_state._complexity, st.session_state._capacity = game.calculate_totals()
+        st.session_state._state_dirty = False
+    return st.session_state._complexity, st.session_state._capacity
+
 # Initialize the Streamlit session state
 def init_session_state():
     if 'game' not in st.session_state:
-        st.session_state.game = TechProgressGame()
-        st.session_state.game_status = "ONGOING"
-        st.session_state.message = ""
-        st.session_state.turn_summary = None
-        st.session_state.show_analysis = False
-        st.session_state.tech_amount = 0
-        st.session_state.selected_tech = None
-        st.session_state.selected_inst = None
-        st.session_state.actions_taken = 0
-        st.session_state.max_actions = 2
-        st.session_state.game_over = False
-        st.session_state.restart = False
+        reset_session_state()
 
 # Main Streamlit app
 def main():
@@ -441,18 +603,7 @@ def main():
     
     # Check for game restart
     if st.session_state.restart:
-        st.session_state.game = TechProgressGame()
-        st.session_state.game_status = "ONGOING"
-        st.session_state.message = ""
-        st.session_state.turn_summary = None
-        st.session_state.show_analysis = False
-        st.session_state.tech_amount = 0
-        st.session_state.selected_tech = None
-        st.session_state.selected_inst = None
-        st.session_state.actions_taken = 0
-        st.session_state.max_actions = 2
-        st.session_state.game_over = False
-        st.session_state.restart = False
+        reset_session_state()
     
     # Page title and introduction
     st.title("🧪 Technology vs. Complexity: Society's Balancing Act")
@@ -460,29 +611,11 @@ def main():
     # Sidebar with game information
     with st.sidebar:
         st.header("Game Information")
-        st.markdown("""
-        ### How to Play
-        
-        In this simulation, you manage society's technological development while building social capacity to handle complexity.
-        
-        **Key Concepts:**
-        - Technologies advance capabilities but increase complexity
-        - Social institutions help absorb and manage complexity
-        - When complexity exceeds capacity, crises occur
-        - The goal is sustainable progress, not just maximum technology
-        
-        **Game Rules:**
-        - You have 2 actions per turn
-        - You can invest in technologies or upgrade institutions
-        - After each turn, complexity grows naturally
-        - Game ends after 30 turns or if complexity overwhelms capacity
-        """)
+        st.markdown(SIDEBAR_MD)
         
         # Only show restart button if game has started
         if st.session_state.turn_summary or st.session_state.game_over:
-            if st.button("Restart Game"):
-                st.session_state.restart = True
-                st.experimental_rerun()
+            st.button("Restart Game", on_click=request_restart)
     
     # Game over screen
     if st.session_state.game_over:
@@ -497,15 +630,14 @@ def main():
     
     with col1:
         # Show turn information
-        st.header(f"Turn {game.turn}/30")
+        st.header(f"Turn {game.turn}/{MAX_TURNS}")
         
         # Resource indicators
         col_rp, col_comp, col_cap = st.columns(3)
         with col_rp:
             st.metric("Research Points", f"{game.research_points}")
         
-        current_complexity = game.calculate_total_complexity()
-        current_capacity = game.calculate_total_social_capacity()
+        current_complexity, current_capacity = get_current_totals(game)
         balance = current_capacity - current_complexity
         
         with col_comp:
@@ -527,7 +659,7 @@ def main():
             st.success("✅ System balance is STABLE. Society is managing complexity well.")
         
         # Display historical chart
-        st.altair_chart(create_history_chart(game), use_container_width=True)
+        st.altair_chart(create_history_chart(*game.history_series()), use_container_width=True)
         
         # Display message
         if st.session_state.message:
@@ -540,7 +672,7 @@ def main():
             st.write(f"**What happened**: {crisis['description']}")
             st.write(f"**Impact**: {crisis['message']}")
             
-            if game.technologies['Biotechnology']['level'] > 0:
+            if game.tech_levels[BIOTECH] > 0:
                 reduction = (crisis['severity'] - crisis['adjusted_severity']) / crisis['severity'] * 100
                 st.info(f"🧬 Biotechnology reduced crisis severity by {reduction:.1f}%")
     
@@ -560,23 +692,20 @@ def main():
         if action == "Invest in Technology":
             st.write("##### Available Technologies")
             
-            tech_options = []
-            for tech, data in game.technologies.items():
-                current_level = data['level']
-                cost_per_level = 10 + (current_level * 2)
-                tech_options.append(f"{data['icon']} {tech} (Cost: {cost_per_level} per level)")
+            tech_names = game.tech_names
+            tech_options = build_tech_options(tuple(game.tech_labels), tuple(game.tech_levels.tolist()))
             
-            selected_tech_display = st.selectbox("Select technology:", tech_options)
+            # The selectbox returns an index into tech_names
+            tech_idx = st.selectbox("Select technology:", range(len(tech_names)),
+                                    format_func=lambda i: tech_options[i])
             
-            if selected_tech_display:
-                # Extract tech name from display string
-                tech_name = selected_tech_display.split(" (")[0]
-                tech_name = tech_name[2:]  # Remove icon
+            if tech_idx is not None:
+                tech_name = tech_names[tech_idx]
                 st.session_state.selected_tech = tech_name
                 
                 # Show tech details
                 data = game.technologies[tech_name]
-                current_level = data['level']
+                current_level = int(game.tech_levels[tech_idx])
                 cost_per_level = 10 + (current_level * 2)
                 
                 st.write(f"**Current Level**: {current_level}")
@@ -584,18 +713,15 @@ def main():
                 st.write(f"**Description**: {data['description']}")
                 
                 # Special effect
+                effect = game.tech_effect_percentages()[tech_idx]
                 if 'research_bonus' in data:
-                    bonus = data['level'] * data['research_bonus'] * 100
-                    st.write(f"**Research Bonus**: +{bonus:.1f}%")
+                    st.write(f"**Research Bonus**: +{effect:.1f}%")
                 elif 'crisis_resistance' in data:
-                    resist = data['level'] * data['crisis_resistance'] * 100
-                    st.write(f"**Crisis Resistance**: +{resist:.1f}%")
+                    st.write(f"**Crisis Resistance**: +{effect:.1f}%")
                 elif 'complexity_reduction' in data:
-                    reduction = data['level'] * data['complexity_reduction'] * 100
-                    st.write(f"**Complexity Growth Reduction**: -{reduction:.1f}%")
+                    st.write(f"**Complexity Growth Reduction**: -{effect:.1f}%")
                 elif 'capacity_bonus' in data:
-                    cap_bonus = data['level'] * data['capacity_bonus'] * 100
-                    st.write(f"**Capacity Effectiveness**: +{cap_bonus:.1f}%")
+                    st.write(f"**Capacity Effectiveness**: +{effect:.1f}%")
                 
                 # Amount input
                 max_amount = game.research_points
@@ -610,10 +736,13 @@ def main():
                 
                 if st.button("Invest"):
                     success, message = game.invest_in_technology(tech_name, amount)
-                    st.session_state.message = message
                     
                     if success:
-                        st.session_state.actions_taken += 1
+                        st.session_state.update(message=message,
+                                                actions_taken=st.session_state.actions_taken + 1,
+                                                _state_dirty=True)
+                    else:
+                        st.session_state.message = message
                     
                     st.rerun()
         
@@ -625,9 +754,9 @@ def main():
             
             # Format function to display institutions with icons and costs
             def format_institution(inst_key):
-                data = game.institutions[inst_key]
-                cost = data['cost'] * data['level']
-                return f"{data['icon']} {inst_key} (Cost: {cost})"
+                inst_idx = game.inst_names.index(inst_key)
+                cost = int(game.inst_costs[inst_idx] * game.inst_levels[inst_idx])
+                return f"{game.inst_labels[inst_idx]} (Cost: {cost})"
             
             # Use the direct key selection with a formatter
             selected_inst = st.selectbox("Select institution:", inst_options, format_func=format_institution)
@@ -635,7 +764,7 @@ def main():
             if selected_inst:
                 # Now we can safely access the institution data using the selected key
                 data = game.institutions[selected_inst]
-                current_level = data['level']
+                current_level = int(game.inst_levels[game.inst_names.index(selected_inst)])
                 cost = data['cost'] * current_level
                 
                 st.write(f"**Current Level**: {current_level}")
@@ -650,10 +779,13 @@ def main():
                 
                 if st.button("Upgrade", disabled=not can_upgrade):
                     success, message = game.invest_in_institution(selected_inst)
-                    st.session_state.message = message
                     
                     if success:
-                        st.session_state.actions_taken += 1
+                        st.session_state.update(message=message,
+                                                actions_taken=st.session_state.actions_taken + 1,
+                                                _state_dirty=True)
+                    else:
+                        st.session_state.message = message
                     
                     st.rerun()
         
@@ -670,8 +802,12 @@ def main():
                     st.session_state.actions_taken = 0
                     st.session_state.message = ""
                     
+                    # Store the post-turn totals for the metrics after rerun
+                    st.session_state._complexity, st.session_state._capacity = game.calculate_totals()
+                    st.session_state._state_dirty = False
+                    
                     # Check game status
-                    game_status = game.game_status()
+                    game_status = game.game_status(st.session_state._complexity, st.session_state._capacity)
                     st.session_state.game_status = game_status
                     
                     if game_status != "ONGOING":
@@ -687,45 +823,46 @@ def show_system_analysis(game):
     st.markdown("---")
     st.header("System Analysis")
     
-    col1, col2 = st.columns(2)
+    # Complexity and capacity breakdowns, rendered side by side as one chart
+    game.calculate_total_complexity(include_breakdown=True)
+    components = game.complexity_components
+    complexity_chart = create_complexity_chart(components['base'], components['tech_direct'], components['tech_interaction'])
     
-    with col1:
-        # Complexity breakdown
-        st.altair_chart(create_complexity_chart(game), use_container_width=True)
-        
-        # Growth rates
-        complexity_growth = game.complexity_growth_rate * game.calculate_complexity_growth_modifier()
-        st.metric("Complexity Growth Rate", f"{(complexity_growth - 1) * 100:.1f}% per turn")
+    values = game.inst_levels * game.inst_capacity_factors
+    capacity_chart = create_capacity_chart(tuple(game.inst_names), tuple(values.tolist()), tuple(game.inst_icons))
     
-    with col2:
-        # Capacity breakdown
-        st.altair_chart(create_capacity_chart(game), use_container_width=True)
+    chart = alt.hconcat(complexity_chart, capacity_chart).resolve_scale(color='independent')
+    st.altair_chart(chart, use_container_width=True)
+    
+    # Growth rates
+    complexity_growth = game.complexity_growth_rate * game.calculate_complexity_growth_modifier()
+    st.metric("Complexity Growth Rate", f"{(complexity_growth - 1) * 100:.1f}% per turn")
     
     # Technology synergies
     st.subheader("Key Insights")
     col1, col2 = st.columns(2)
     
+    effects = game.tech_effect_percentages()
+    
     with col1:
-        if game.technologies['Clean Energy']['level'] > 0:
-            reduction = game.technologies['Clean Energy']['level'] * game.technologies['Clean Energy']['complexity_reduction'] * 100
+        if game.tech_levels[CLEAN_ENERGY] > 0:
+            reduction = effects[CLEAN_ENERGY]
             st.success(f"🌱 Clean Energy is helping slow complexity growth by {reduction:.1f}%")
         
-        if game.technologies['AI & Automation']['level'] > 0:
-            bonus = game.technologies['AI & Automation']['level'] * game.technologies['AI & Automation']['research_bonus'] * 100
+        if game.tech_levels[AI_AUTOMATION] > 0:
+            bonus = effects[AI_AUTOMATION]
             st.info(f"🤖 AI is increasing research efficiency by {bonus:.1f}%")
     
     with col2:
-        if game.technologies['Biotechnology']['level'] > 0:
-            resist = game.technologies['Biotechnology']['level'] * game.technologies['Biotechnology']['crisis_resistance'] * 100
+        if game.tech_levels[BIOTECH] > 0:
+            resist = effects[BIOTECH]
             st.success(f"🧬 Biotechnology is improving crisis resilience by {resist:.1f}%")
         
-        if game.technologies['Information Systems']['level'] > 0:
-            cap_bonus = game.technologies['Information Systems']['level'] * game.technologies['Information Systems']['capacity_bonus'] * 100
+        if game.tech_levels[INFO_SYS] > 0:
+            cap_bonus = effects[INFO_SYS]
             st.info(f"💾 Information Systems are enhancing institutional effectiveness by {cap_bonus:.1f}%")
     
-    if st.button("Close Analysis"):
-        st.session_state.show_analysis = False
-        st.experimental_rerun()
+    st.button("Close Analysis", on_click=close_analysis)
 
 def show_game_over():
     game = st.session_state.game
@@ -733,18 +870,20 @@ def show_game_over():
     
     # Game over header
     if "VICTORY" in status:
-        st.balloons()
+        # Celebrate only on the first render of the game-over screen
+        if not st.session_state._balloons_shown:
+            st.balloons()
+            st.session_state._balloons_shown = True
         st.success(f"# 🏆 {status}")
     else:
         st.error(f"# ⚠️ {status}")
     
-    # Final stats
-    final_complexity = game.calculate_total_complexity()
-    final_capacity = game.calculate_total_social_capacity()
+    # Final stats (stored when the last turn ended)
+    final_complexity, final_capacity = get_current_totals(game)
     
     col1, col2, col3 = st.columns(3)
     with col1:
-        st.metric("Final Turn", f"{game.turn}/30")
+        st.metric("Final Turn", f"{game.turn}/{MAX_TURNS}")
     with col2:
         st.metric("Final Complexity", f"{final_complexity:.1f}")
     with col3:
@@ -752,15 +891,16 @@ def show_game_over():
                  delta=f"{final_capacity - final_complexity:.1f}",
                  delta_color="inverse")
     
-    # Historical chart
+    # Historical chart (history is frozen at game over, so build it once per game)
     st.subheader("Your Journey")
-    st.altair_chart(create_history_chart(game), use_container_width=True)
+    if st.session_state.final_history_chart is None:
+        st.session_state.final_history_chart = create_history_chart(*game.history_series())
+    st.altair_chart(st.session_state.final_history_chart, use_container_width=True)
     
     # Feedback based on play style
     st.subheader("Your Approach")
     
-    tech_levels = sum(tech['level'] for tech in game.technologies.values())
-    inst_levels = sum(inst['level'] for inst in game.institutions.values())
+    tech_levels, inst_levels = game.summary_levels()
     
     if tech_levels > inst_levels * 1.5:
         st.write("You prioritized technological advancement over social capacity. This created rapid progress but high instability.")
@@ -769,53 +909,20 @@ def show_game_over():
     else:
         st.write("You maintained a balanced approach to progress, both advancing technology and building social capacity.")
     
+    # Levels are frozen at game over, so build the breakdown data once per game
+    if st.session_state.final_tech_levels is None:
+        st.session_state.final_tech_levels = create_tech_levels_data(tuple(game.tech_labels),
+                                                                     tuple(game.tech_levels.tolist()))
+        st.session_state.final_inst_levels = create_institution_levels_data(tuple(game.inst_labels),
+                                                                            tuple(game.inst_levels.tolist()))
+    
     # Technology breakdown
     st.subheader("Technology Development")
-    tech_data = []
-    for tech, data in game.technologies.items():
-        tech_data.append({
-            'Technology': f"{data['icon']} {tech}",
-            'Level': data['level']
-        })
-    
-    tech_df = pd.DataFrame(tech_data)
-    
-    # Create bar chart for technologies
-    tech_chart = alt.Chart(tech_df).mark_bar().encode(
-        x=alt.X('Level:Q', title='Level Achieved'),
-        y=alt.Y('Technology:N', title=None, sort='-x'),
-        color=alt.Color('Technology:N', legend=None)
-    ).properties(
-        title='Technology Levels',
-        width=600,
-        height=200
-    )
-    
-    st.altair_chart(tech_chart, use_container_width=True)
+    st.bar_chart(st.session_state.final_tech_levels, horizontal=True)
     
     # Institution breakdown
     st.subheader("Social Institutions")
-    inst_data = []
-    for inst, data in game.institutions.items():
-        inst_data.append({
-            'Institution': f"{data['icon']} {inst}",
-            'Level': data['level']
-        })
-    
-    inst_df = pd.DataFrame(inst_data)
-    
-    # Create bar chart for institutions
-    inst_chart = alt.Chart(inst_df).mark_bar().encode(
-        x=alt.X('Level:Q', title='Level Achieved'),
-        y=alt.Y('Institution:N', title=None, sort='-x'),
-        color=alt.Color('Institution:N', legend=None)
-    ).properties(
-        title='Institution Levels',
-        width=600,
-        height=200
-    )
-    
-    st.altair_chart(inst_chart, use_container_width=True)
+    st.bar_chart(st.session_state.final_inst_levels, horizontal=True)
     
     # Educational summary
     st.subheader("Lessons From Your Simulation")
@@ -823,26 +930,14 @@ def show_game_over():
     
     with col1:
         st.info("#### Technology and Complexity")
-        st.markdown("""
-        - Technology creates both opportunities and complexities
-        - Different technologies interact to create additional complexity
-        - Some technologies can help manage complexity (like Clean Energy)
-        - Balanced technological development is more sustainable
-        """)
+        st.markdown(TECH_LESSONS_MD)
     
     with col2:
         st.success("#### Social Capacity")
-        st.markdown("""
-        - Social systems need to evolve alongside technology
-        - Crisis occurs when complexity outpaces absorption capacity
-        - Different institutions address different aspects of complexity
-        - Sustainable progress requires balance and foresight
-        """)
+        st.markdown(SOCIAL_LESSONS_MD)
     
     # Restart button
-    if st.button("Play Again"):
-        st.session_state.restart = True
-        st.experimental_rerun()
+    st.button("Play Again", on_click=request_restart)
 
 # Entry point
 if __name__ == "__main__":